@@ -1,30 +1,100 @@
 #!/usr/bin/env python3
 """Configuration for AI Test Framework."""
 
+import json
 import os
-from dotenv import load_dotenv
+from dotenv import dotenv_values, find_dotenv
+
+ENV_CACHE_FILE = '.env.cache.json'
+
+def _load_dotenv_cached():
+    """Load .env into os.environ, reusing a parsed sidecar while .env is unchanged."""
+    env_path = find_dotenv()
+    if not env_path:
+        return
+    
+    mtime_ns = os.stat(env_path).st_mtime_ns
+    cache_path = os.path.join(os.path.dirname(env_path), ENV_CACHE_FILE)
+    
+    values = None
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('mtime_ns') == mtime_ns:
+            values = cached['values']
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    if values is None:
+        values = {k: v for k, v in dotenv_values(env_path).items() if v is not None}
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            # The sidecar holds API keys: owner-only, whatever the umask
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'mtime_ns': mtime_ns, 'values': values}, f)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            # Cache is best effort (e.g. read-only checkout)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    
+    # Same semantics as load_dotenv(): never override variables already set
+    os.environ.update({k: v for k, v in values.items() if k not in os.environ})
 
 # Load environment variables
-load_dotenv()
+_load_dotenv_cached()
 
-class Config:
-    """Configuration settings for the test framework."""
+def _as_bool(value):
+    return value.lower() == 'true'
+
+class _LazyConfig(type):
+    """Resolve settings from the environment on first access and memoize them."""
     
-    # API Configuration
-    GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
-    MODEL_NAME = os.getenv('MODEL_NAME', 'gemini-2.0-flash')
+    # Attribute name -> (environment variable, default, coercion)
+    _settings = {
+        # API Configuration
+        'GOOGLE_API_KEY': ('GOOGLE_API_KEY', None, None),
+        'MODEL_NAME': ('MODEL_NAME', 'gemini-2.0-flash', None),
+        
+        # Target Application
+        'TARGET_URL': ('TARGET_URL', 'http://localhost:3000', None),
+        
+        # Browser Settings
+        'CHROME_CDP_PORT': ('CHROME_CDP_PORT', '9222', int),
+        'HEADLESS': ('BROWSER_USE_HEADLESS', 'false', _as_bool),
+        
+        # Test Settings
+        'TEST_CASES_DIR': ('TEST_CASES_DIR', 'test_cases', None),
+        'REPORTS_DIR': ('REPORTS_DIR', 'reports', None),
+        'SCREENSHOTS_DIR': ('SCREENSHOTS_DIR', 'reports/screenshots', None),
+    }
     
-    # Target Application
-    TARGET_URL = os.getenv('TARGET_URL', 'http://localhost:3000')
+    def __getattr__(cls, name):
+        try:
+            env_var, default, coerce = cls._settings[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        
+        value = os.environ.get(env_var, default)
+        if coerce is not None and value is not None:
+            value = coerce(value)
+        
+        # Cache on the class so later lookups never reach __getattr__
+        setattr(cls, name, value)
+        return value
     
-    # Browser Settings
-    CHROME_CDP_PORT = int(os.getenv('CHROME_CDP_PORT', '9222'))
-    HEADLESS = os.getenv('BROWSER_USE_HEADLESS', 'false').lower() == 'true'
+    def __dir__(cls):
+        return sorted(set(super().__dir__()) | set(cls._settings))
+
+class Config(metaclass=_LazyConfig):
+    """Configuration settings for the test framework.
     
-    # Test Settings
-    TEST_CASES_DIR = os.getenv('TEST_CASES_DIR', 'test_cases')
-    REPORTS_DIR = os.getenv('REPORTS_DIR', 'reports')
-    SCREENSHOTS_DIR = os.getenv('SCREENSHOTS_DIR', 'reports/screenshots')
+    Settings are read from the environment the first time they are accessed
+    (see _LazyConfig._settings for names, variables and defaults).
+    """
     
     # Validation
     @classmethod
@@ -38,9 +108,25 @@ class Config:
         
         return True
 
+# Directories already created (or found) during this process
+_ENSURED = set()
+
+def _mkdir(path):
+    """Create path with a single mkdir; only walk parents when one is missing."""
+    try:
+        os.mkdir(path)
+    except FileExistsError:
+        pass
+    except FileNotFoundError:
+        os.makedirs(path, exist_ok=True)
+
 # Create directories if they don't exist
 def ensure_directories():
     """Ensure required directories exist."""
-    os.makedirs(Config.TEST_CASES_DIR, exist_ok=True)
-    os.makedirs(Config.REPORTS_DIR, exist_ok=True)
-    os.makedirs(Config.SCREENSHOTS_DIR, exist_ok=True)
\ No newline at end of file
+    # REPORTS_DIR comes before SCREENSHOTS_DIR so the default nested
+    # 'reports/screenshots' needs only one mkdir
+    for path in (Config.TEST_CASES_DIR, Config.REPORTS_DIR, Config.SCREENSHOTS_DIR):
+        if path in _ENSURED:
+            continue
+        _mkdir(path)
+        _ENSURED.add(path)
@@ -3,153 +3,394 @@ Browser-use agent creation and management module
 """
 
 import asyncio
+import functools
+import itertools
 import logging
 import os
-from typing import Dict, List, Optional, Any
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Any, Set, Tuple, Union
+from dataclasses import dataclass
 from datetime import datetime
+from urllib.parse import urlsplit
 
+import httpx
 from browser_use import Agent, BrowserSession, BrowserProfile
-from browser_use.llm import ChatOpenAI, ChatAnthropic, ChatGoogle
 
 logger = logging.getLogger(__name__)
 
 
+# Existing Chrome instance to attach to when use_existing_chrome is set;
+# the probe result is reused for _CDP_PROBE_TTL seconds
+_CDP_HOST = "localhost"
+_CDP_PORT = 9222
+_CDP_URL = f"http://{_CDP_HOST}:{_CDP_PORT}"
+_CDP_PROBE_TIMEOUT = 0.2
+_CDP_PROBE_TTL = 60.0
+
+# Flags for newly launched Chromium instances (copied per profile because
+# browser-use may mutate the list)
+_CHROMIUM_ARGS = (
+    "--no-first-run",           # Skip first-run experience
+    "--no-default-browser-check", # Don't check if default browser
+    "--disable-default-apps",   # Don't load default apps
+    "--disable-extensions",     # Disable extensions
+    "--start-maximized",        # Start maximized
+    "--disable-popup-blocking", # Disable popup blocking
+    "--disable-background-timer-throttling",  # Better for automation
+    "--disable-renderer-backgrounding",       # Better for automation
+    "--disable-backgrounding-occluded-windows", # Better for automation
+    "--disable-web-security",  # Disable web security for testing
+    "--disable-features=VizDisplayCompositor", # Fix display issues
+    "--disable-dev-shm-usage", # Overcome limited resource problems
+    "--no-sandbox",             # Disable sandboxing
+    "--disable-gpu-sandbox",    # Disable GPU sandboxing
+)
+
+
+# Agent ids: second-resolution timestamp plus a process-wide counter so that
+# agents created within the same second never collide
+_agent_id_counter = itertools.count()
+_date_prefix_cache = (0, "")
+
+
+def _agent_id_suffix() -> str:
+    """Return the '%Y%m%d_%H%M%S' stamp, formatted at most once per second"""
+    global _date_prefix_cache
+    now = int(time.time())
+    if _date_prefix_cache[0] != now:
+        _date_prefix_cache = (now, time.strftime('%Y%m%d_%H%M%S', time.localtime(now)))
+    return _date_prefix_cache[1]
+
+
+@dataclass(slots=True, frozen=True)
+class TestCase:
+    """Test case parsed once at the ingestion boundary"""
+    id: str
+    name: str
+    description: str
+    target_url: str
+    steps: Tuple[str, ...]
+    expected_results: Tuple[str, ...]
+    priority: str = "medium"
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TestCase":
+        return cls(
+            id=data["id"],
+            name=data["name"],
+            description=data["description"],
+            target_url=data["target_url"],
+            steps=tuple(data["steps"]),
+            expected_results=tuple(data["expected_results"]),
+            priority=data.get("priority", "medium")
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class AgentConfig:
+    """Browser/agent options used by TestAgent (unknown keys are ignored)"""
+    use_existing_chrome: bool = True
+    browser_type: str = "chromium"
+    headless: bool = False
+    max_steps: int = 25
+    keep_browser_open: bool = False
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AgentConfig":
+        return cls(**{name: data[name] for name in cls.__dataclass_fields__ if name in data})
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_llm_provider(http_client: Optional[httpx.AsyncClient] = None):
+    """Select the LLM provider once per process based on available API keys
+    
+    http_client, when given, is shared by providers built on httpx (OpenAI,
+    Anthropic) so their requests reuse pooled keep-alive connections.
+    """
+    google_key = os.getenv("GOOGLE_API_KEY")
+    openai_key = os.getenv("OPENAI_API_KEY")
+    anthropic_key = os.getenv("ANTHROPIC_API_KEY")
+    
+    try:
+        # Check for Google Gemini API key first (recommended by browser-use)
+        if google_key:
+            # Provider SDKs are imported only for the branch that is taken
+            from browser_use.llm import ChatGoogle
+            llm_provider = ChatGoogle(
+                model="gemini-1.5-pro",
+                api_key=google_key,
+                temperature=0.0
+            )
+            logger.info("Using Google Gemini LLM provider")
+            return llm_provider
+        
+        # Fallback to other providers if available
+        if openai_key:
+            from browser_use.llm import ChatOpenAI
+            llm_provider = ChatOpenAI(
+                model="gpt-4o",
+                temperature=0.0,
+                api_key=openai_key,
+                http_client=http_client
+            )
+            logger.info("Using OpenAI LLM provider")
+            return llm_provider
+        
+        if anthropic_key:
+            from browser_use.llm import ChatAnthropic
+            llm_provider = ChatAnthropic(
+                model="claude-3-sonnet-20240229",
+                temperature=0.0,
+                api_key=anthropic_key,
+                http_client=http_client
+            )
+            logger.info("Using Anthropic Claude LLM provider")
+            return llm_provider
+        
+        # If no API keys available, use a mock provider for testing
+        logger.warning("No LLM API keys found. Using mock provider for testing.")
+        return MockLLMProvider()
+        
+    except Exception as e:
+        logger.error("Failed to setup LLM provider: %s", e)
+        return MockLLMProvider()
+
+
+# "1. ", "2. ", ... prebuilt for numbering task steps and expected results
+_LINE_PREFIXES = tuple(f"{i}. " for i in range(1, 256))
+
+
+def _iter_numbered(items: Tuple[str, ...]) -> Iterator[str]:
+    """Yield items as a numbered list"""
+    if len(items) <= len(_LINE_PREFIXES):
+        return map(str.__add__, _LINE_PREFIXES, items)
+    return (f"{i}. {item}" for i, item in enumerate(items, 1))
+
+
+def _iter_task_lines(test_case: TestCase) -> Iterator[str]:
+    """Yield the lines of the natural language task for a test case"""
+    yield f"Test Case: {test_case.name}"
+    yield f"Description: {test_case.description}"
+    yield f"Target URL: {test_case.target_url}"
+    yield ""
+    yield "Test Steps:"
+    
+    yield from _iter_numbered(test_case.steps)
+    
+    yield ""
+    yield "Expected Results:"
+    
+    yield from _iter_numbered(test_case.expected_results)
+    
+    yield ""
+    yield "Please execute this test carefully and report any issues you find."
+    yield "Take screenshots of important steps and any problems discovered."
+    yield "Provide a clear summary of the test results."
+
+
+def _summary_from_dict(agent_result: Dict[str, Any]) -> str:
+    if 'message' in agent_result:
+        return agent_result['message']
+    return "Test executed successfully. Task completed: Unknown"
+
+
+def _resolve_summary_extractor(agent_result) -> Callable[[Any], str]:
+    """Pick the summary extractor for a result type by probing one instance"""
+    if hasattr(agent_result, 'get_final_message'):
+        return lambda r: r.get_final_message()
+    if hasattr(agent_result, 'message'):
+        return lambda r: r.message
+    if isinstance(agent_result, dict):
+        return _summary_from_dict
+    if isinstance(agent_result, str):
+        return lambda r: r
+    if hasattr(agent_result, 'is_done'):
+        return lambda r: f"Test executed successfully. Task completed: {r.is_done()}"
+    return lambda r: "Test executed successfully. Task completed: Unknown"
+
+
+# Summary extractor per agent result type, resolved on first sight of the type
+_EXTRACTOR_CACHE: Dict[type, Callable[[Any], str]] = {}
+
+
+async def _launch_browser_session(config: AgentConfig, keep_alive: bool = False) -> BrowserSession:
+    """Start a new Chromium instance for the given configuration"""
+    logger.info("Creating new Chromium browser instance")
+    
+    browser_profile = BrowserProfile(
+        browser_type=config.browser_type,
+        headless=config.headless,
+        viewport=None,
+        # Do NOT set viewport or window_size - let Chrome handle window sizing
+        wait_for_network_idle_page_load_time=3.0,
+        extra_chromium_args=list(_CHROMIUM_ARGS),
+        # Pooled sessions must survive Agent.run() so they can be reused
+        keep_alive=keep_alive
+    )
+    
+    browser_session = BrowserSession(browser_profile=browser_profile)
+    await browser_session.start()
+    logger.info("Started new Chromium browser instance")
+    return browser_session
+
+
+def _origin_of(url: str) -> Optional[str]:
+    parts = urlsplit(url)
+    if parts.scheme in ("http", "https") and parts.netloc:
+        return f"{parts.scheme}://{parts.netloc}"
+    return None
+
+
+def _track_origins(browser_session: BrowserSession) -> Set[str]:
+    """Collect every http(s) origin the session's context sends a request to"""
+    origins: Set[str] = set()
+    
+    def on_request(request):
+        origin = _origin_of(request.url)
+        if origin is not None:
+            origins.add(origin)
+    
+    browser_session.browser_context.on("request", on_request)
+    return origins
+
+
+async def _reset_browser_session(browser_session: BrowserSession, origins: Set[str]) -> bool:
+    """Leave one blank tab and wipe all browsing data so the next test starts clean; False if unusable"""
+    try:
+        context = browser_session.browser_context
+        pages = list(context.pages)
+        origins.update(filter(None, (_origin_of(page.url) for page in pages)))
+        
+        # Close every tab the previous test opened except one
+        page = pages[0] if pages else await context.new_page()
+        for extra in pages[1:]:
+            await extra.close()
+        await page.goto("about:blank")
+        for attr in ("agent_current_page", "human_current_page"):
+            if hasattr(browser_session, attr):
+                setattr(browser_session, attr, page)
+        
+        # Cookies and HTTP cache are browser-wide; IndexedDB, service workers,
+        # cache storage and web storage are cleared per visited origin.
+        # CDP is Chromium-only, so other browsers are discarded instead of reused
+        cdp = await context.new_cdp_session(page)
+        try:
+            await cdp.send("Network.clearBrowserCookies")
+            await cdp.send("Network.clearBrowserCache")
+            await asyncio.gather(*(
+                cdp.send("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+                for origin in origins
+            ))
+        finally:
+            await cdp.detach()
+        origins.clear()
+        return True
+    except Exception as e:
+        logger.warning("Could not reset browser session, discarding it: %s", e)
+        return False
+
+
+async def _close_browser_session(browser_session: BrowserSession):
+    """Fully shut down a session, including keep_alive ones"""
+    kill = getattr(browser_session, "kill", None)
+    if kill is not None:
+        await kill()
+    else:
+        await browser_session.close()
+
+
 class TestAgent:
     """Individual test agent for executing a single test case"""
     
-    def __init__(self, test_case: Dict[str, Any], config: Dict[str, Any]):
-        self.test_case = test_case
-        self.config = config
+    def __init__(self, test_case: Union[TestCase, Dict[str, Any]], config: Union[AgentConfig, Dict[str, Any]],
+                 session_pool: Optional["BrowserSessionPool"] = None):
+        self.test_case = test_case if isinstance(test_case, TestCase) else TestCase.from_dict(test_case)
+        self.config = config if isinstance(config, AgentConfig) else AgentConfig.from_dict(config)
+        self.session_pool = session_pool
+        self._pooled_session = False
+        # Pure function of the test case, built before any browser work starts
+        self._task_description = self._build_task_description()
         self.agent: Optional[Agent] = None
         self.browser_session: Optional[BrowserSession] = None
         self.status = "initialized"
         self.results = {}
-        self.start_time = None
+        self._start_monotonic = 0.0
         self.end_time = None
         
-    async def create_agent(self, llm_provider):
-        """Create browser-use agent with specified configuration"""
+    async def create_agent(self, llm_provider, cdp_available: bool = True):
+        """Create browser-use agent with specified configuration
+        
+        cdp_available=False skips the attempt to attach to an existing Chrome
+        (the caller already knows nothing is listening on the CDP port).
+        """
         try:
             # Check user's browser preference
-            use_existing_chrome = self.config.get("use_existing_chrome", True)
+            use_existing_chrome = self.config.use_existing_chrome and cdp_available
             
             if use_existing_chrome:
                 # Try to connect to existing Chrome first (using standard port 9222)
                 try:
-                    self.browser_session = BrowserSession(cdp_url="http://localhost:9222")
+                    self.browser_session = BrowserSession(cdp_url=_CDP_URL)
                     await self.browser_session.start()
                     logger.info("Connected to existing Chrome browser")
                 except Exception as e:
                     # Fall back to new browser if no existing one
-                    logger.warning(f"Could not connect to existing Chrome: {e}")
+                    logger.warning("Could not connect to existing Chrome: %s", e)
                     logger.info("Falling back to new browser instance")
                     use_existing_chrome = False
             
             if not use_existing_chrome:
-                # Create new browser instance
-                logger.info("Creating new Chromium browser instance")
-
-                
-                browser_profile = BrowserProfile(
-                    browser_type=self.config.get("browser_type", "chromium"),
-                    headless=self.config.get("headless", False),
-                    viewport=None,
-                    # Do NOT set viewport or window_size - let Chrome handle window sizing
-                    wait_for_network_idle_page_load_time=3.0,
-                    extra_chromium_args=[
-                        "--no-first-run",           # Skip first-run experience
-                        "--no-default-browser-check", # Don't check if default browser
-                        "--disable-default-apps",   # Don't load default apps
-                        "--disable-extensions",     # Disable extensions
-                        "--start-maximized",        # Start maximized
-                        "--disable-popup-blocking", # Disable popup blocking
-                        "--disable-background-timer-throttling",  # Better for automation
-                        "--disable-renderer-backgrounding",       # Better for automation
-                        "--disable-backgrounding-occluded-windows", # Better for automation
-                        "--disable-web-security",  # Disable web security for testing
-                        "--disable-features=VizDisplayCompositor", # Fix display issues
-                        "--disable-dev-shm-usage", # Overcome limited resource problems
-                        "--no-sandbox",             # Disable sandboxing
-                        "--disable-gpu-sandbox"     # Disable GPU sandboxing
-                    ]
-                )
-                
-                self.browser_session = BrowserSession(browser_profile=browser_profile)
-                await self.browser_session.start()
-                logger.info("Started new Chromium browser instance")
-            
-            # Build natural language task from test case
-            task_description = self._build_task_description()
+                # Reuse a pooled browser when the manager provides one
+                if self.session_pool is not None:
+                    self.browser_session = await self.session_pool.acquire(self.config)
+                    self._pooled_session = True
+                else:
+                    self.browser_session = await _launch_browser_session(self.config)
             
             # Create agent
             self.agent = Agent(
-                task=task_description,
+                task=self._task_description,
                 llm=llm_provider,
                 browser_session=self.browser_session,
                 use_vision=True,
-                max_steps=self.config.get("max_steps", 25),
+                max_steps=self.config.max_steps,
                 generate_gif=False
             )
             
             self.status = "ready"
-            logger.info(f"Agent created for test case: {self.test_case['name']}")
+            logger.info("Agent created for test case: %s", self.test_case.name)
             
         except Exception as e:
             self.status = "error"
-            logger.error(f"Failed to create agent for {self.test_case['name']}: {e}")
+            logger.error("Failed to create agent for %s: %s", self.test_case.name, e)
             raise
     
     def _build_task_description(self) -> str:
         """Build natural language task description from test case"""
-        task_parts = [
-            f"Test Case: {self.test_case['name']}",
-            f"Description: {self.test_case['description']}",
-            f"Target URL: {self.test_case['target_url']}",
-            "",
-            "Test Steps:"
-        ]
-        
-        for i, step in enumerate(self.test_case['steps'], 1):
-            task_parts.append(f"{i}. {step}")
-        
-        task_parts.extend([
-            "",
-            "Expected Results:"
-        ])
-        
-        for i, result in enumerate(self.test_case['expected_results'], 1):
-            task_parts.append(f"{i}. {result}")
-        
-        task_parts.extend([
-            "",
-            "Please execute this test carefully and report any issues you find.",
-            "Take screenshots of important steps and any problems discovered.",
-            "Provide a clear summary of the test results."
-        ])
-        
-        return "\n".join(task_parts)
+        return "\n".join(_iter_task_lines(self.test_case))
     
     async def execute(self) -> Dict[str, Any]:
         """Execute the test case using browser-use agent"""
         if not self.agent:
             raise ValueError("Agent not created. Call create_agent() first.")
         
+        self._start_monotonic = time.monotonic()
+        
         try:
             self.status = "running"
-            self.start_time = datetime.now()
             
-            logger.info(f"Starting test execution: {self.test_case['name']}")
+            logger.info("Starting test execution: %s", self.test_case.name)
             
             # Execute the test using browser-use
             result = await self.agent.run()
             
+            execution_time = time.monotonic() - self._start_monotonic
             self.end_time = datetime.now()
-            execution_time = (self.end_time - self.start_time).total_seconds()
             
             # Process results
             self.results = {
-                "test_case_id": self.test_case["id"],
-                "test_case_name": self.test_case["name"],
+                "test_case_id": self.test_case.id,
+                "test_case_name": self.test_case.name,
                 "status": "completed",
                 "execution_time": execution_time,
                 "agent_result": result,
@@ -159,25 +400,25 @@ class TestAgent:
             }
             
             self.status = "completed"
-            logger.info(f"Test completed: {self.test_case['name']} in {execution_time:.2f}s")
+            logger.info("Test completed: %s in %.2fs", self.test_case.name, execution_time)
             
             return self.results
             
         except Exception as e:
+            execution_time = time.monotonic() - self._start_monotonic
             self.end_time = datetime.now()
-            execution_time = (self.end_time - self.start_time).total_seconds() if self.start_time else 0
             
             self.results = {
-                "test_case_id": self.test_case["id"],
-                "test_case_name": self.test_case["name"],
+                "test_case_id": self.test_case.id,
+                "test_case_name": self.test_case.name,
                 "status": "error",
                 "execution_time": execution_time,
                 "error": str(e),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": self.end_time.isoformat()
             }
             
             self.status = "error"
-            logger.error(f"Test execution failed: {self.test_case['name']}: {e}")
+            logger.error("Test execution failed: %s: %s", self.test_case.name, e)
             
             return self.results
         
@@ -187,16 +428,11 @@ class TestAgent:
     def _extract_summary(self, agent_result) -> str:
         """Extract summary from agent result"""
         try:
-            if hasattr(agent_result, 'get_final_message'):
-                return agent_result.get_final_message()
-            elif hasattr(agent_result, 'message'):
-                return agent_result.message
-            elif isinstance(agent_result, dict) and 'message' in agent_result:
-                return agent_result['message']
-            elif isinstance(agent_result, str):
-                return agent_result
-            else:
-                return f"Test executed successfully. Task completed: {agent_result.is_done() if hasattr(agent_result, 'is_done') else 'Unknown'}"
+            result_type = type(agent_result)
+            extractor = _EXTRACTOR_CACHE.get(result_type)
+            if extractor is None:
+                extractor = _EXTRACTOR_CACHE[result_type] = _resolve_summary_extractor(agent_result)
+            return extractor(agent_result)
         except Exception as e:
             return f"Test completed with result processing error: {str(e)}"
     
@@ -204,83 +440,186 @@ class TestAgent:
         """Clean up browser resources"""
         try:
             if self.browser_session:
-                if not self.config.get('keep_browser_open', False):
-                    await self.browser_session.close()
-                    logger.info(f"Browser session closed for test: {self.test_case['name']}")
+                if self.config.keep_browser_open:
+                    logger.info("Browser session kept open for test: %s", self.test_case.name)
+                elif self._pooled_session:
+                    await self.session_pool.release(self.config, self.browser_session)
+                    logger.info("Browser session returned to pool for test: %s", self.test_case.name)
                 else:
-                    logger.info(f"Browser session kept open for test: {self.test_case['name']}")
+                    await self.browser_session.close()
+                    logger.info("Browser session closed for test: %s", self.test_case.name)
+                # cleanup() can run twice (after execute() and from stop_agent)
+                self.browser_session = None
         except Exception as e:
-            logger.error(f"Error closing browser session for {self.test_case['name']}: {e}")
+            logger.error("Error closing browser session for %s: %s", self.test_case.name, e)
+
+class BrowserSessionPool:
+    """Idle browser sessions reused across tests, keyed by launch profile"""
+    
+    def __init__(self, max_idle: int = 2):
+        self.max_idle = max_idle
+        self._idle: Dict[Tuple[str, bool], asyncio.Queue] = {}
+        # Origins each pooled session has requested since its last reset, by id(session)
+        self._origins: Dict[int, Set[str]] = {}
+    
+    async def _launch(self, config: AgentConfig) -> BrowserSession:
+        session = await _launch_browser_session(config, keep_alive=True)
+        self._origins[id(session)] = _track_origins(session)
+        return session
+    
+    async def _discard(self, session: BrowserSession):
+        self._origins.pop(id(session), None)
+        await _close_browser_session(session)
+    
+    async def acquire(self, config: AgentConfig) -> BrowserSession:
+        """Take an idle session for the profile or launch a new one"""
+        queue = self._idle.get((config.browser_type, config.headless))
+        if queue is not None and not queue.empty():
+            logger.info("Reusing pooled browser session")
+            return queue.get_nowait()
+        return await self._launch(config)
+    
+    async def release(self, config: AgentConfig, session: BrowserSession):
+        """Reset a session and keep it for the next test, or close it if the pool is full"""
+        key = (config.browser_type, config.headless)
+        queue = self._idle.setdefault(key, asyncio.Queue(maxsize=self.max_idle))
+        origins = self._origins.setdefault(id(session), set())
+        if queue.full() or not await _reset_browser_session(session, origins):
+            await self._discard(session)
+            return
+        try:
+            queue.put_nowait(session)
+        except asyncio.QueueFull:
+            # Concurrent releases filled the pool while this one was resetting
+            await self._discard(session)
+    
+    async def prefill(self, config: AgentConfig, count: int):
+        """Launch sessions up front so the first tests skip browser startup"""
+        self.max_idle = max(self.max_idle, count)
+        key = (config.browser_type, config.headless)
+        queue = self._idle.setdefault(key, asyncio.Queue(maxsize=self.max_idle))
+        while queue.qsize() < count:
+            queue.put_nowait(await self._launch(config))
+    
+    async def close_all(self):
+        """Close every idle session"""
+        for queue in self._idle.values():
+            while not queue.empty():
+                session = queue.get_nowait()
+                try:
+                    await self._discard(session)
+                except Exception as e:
+                    logger.error("Error closing pooled browser session: %s", e)
+        self._idle.clear()
 
 class BrowserAgentManager:
     """Manager for creating and coordinating multiple browser-use agents"""
     
-    def __init__(self):
+    def __init__(self, session_pool_size: int = 2):
         self.active_agents: Dict[str, TestAgent] = {}
         self.llm_provider = None
+        self.http_client: Optional[httpx.AsyncClient] = None
+        self._session_pool = BrowserSessionPool(max_idle=session_pool_size)
+        self.reuse_sessions = True
+        self._cdp_available: Optional[bool] = None
+        self._cdp_checked_at = 0.0
         self._setup_llm_provider()
     
-    def _setup_llm_provider(self):
+    def _setup_llm_provider(self, refresh: bool = False):
         """Setup LLM provider based on available API keys"""
+        if refresh:
+            _resolve_llm_provider.cache_clear()
+        self.llm_provider = _resolve_llm_provider(self.http_client)
+    
+    def set_http_client(self, http_client: Optional[httpx.AsyncClient]):
+        """Share an application-owned HTTP client with the LLM provider"""
+        self.http_client = http_client
+        self._setup_llm_provider()
+    
+    def set_session_reuse(self, reuse: bool):
+        """Toggle browser reuse; when off every agent launches and closes its own browser"""
+        self.reuse_sessions = reuse
+    
+    @property
+    def session_pool(self) -> Optional[BrowserSessionPool]:
+        return self._session_pool if self.reuse_sessions else None
+    
+    async def warm_up(self, pool_size: int, config: Dict[str, Any]):
+        """Pre-launch pool_size browser sessions for the given configuration"""
+        if not self.reuse_sessions or pool_size <= 0:
+            return
+        await self._session_pool.prefill(AgentConfig.from_dict(config), pool_size)
+        logger.info("Warmed browser session pool with %s sessions", pool_size)
+    
+    def _register_agent(self, agent: TestAgent) -> str:
+        agent_id = f"agent_{agent.test_case.id}_{_agent_id_suffix()}_{next(_agent_id_counter)}"
+        self.active_agents[agent_id] = agent
+        logger.info("Created agent %s for test case: %s", agent_id, agent.test_case.name)
+        return agent_id
+    
+    async def _probe_cdp(self) -> bool:
+        """Check whether an existing Chrome is listening on the CDP port (cached)"""
+        if self._cdp_available is not None and time.monotonic() - self._cdp_checked_at < _CDP_PROBE_TTL:
+            return self._cdp_available
+        
         try:
-            # Check for Google Gemini API key first (recommended by browser-use)
-            if os.getenv("GOOGLE_API_KEY"):
-                self.llm_provider = ChatGoogle(
-                    model="gemini-1.5-pro",
-                    api_key=os.getenv("GOOGLE_API_KEY"),
-                    temperature=0.0
-                )
-                logger.info("Using Google Gemini LLM provider")
-                return
-            
-            # Fallback to other providers if available
-            if os.getenv("OPENAI_API_KEY"):
-                self.llm_provider = ChatOpenAI(
-                    model="gpt-4o",
-                    temperature=0.0,
-                    api_key=os.getenv("OPENAI_API_KEY")
-                )
-                logger.info("Using OpenAI LLM provider")
-                return
-            
-            if os.getenv("ANTHROPIC_API_KEY"):
-                self.llm_provider = ChatAnthropic(
-                    model="claude-3-sonnet-20240229",
-                    temperature=0.0,
-                    api_key=os.getenv("ANTHROPIC_API_KEY")
-                )
-                logger.info("Using Anthropic Claude LLM provider")
-                return
-            
-            # If no API keys available, use a mock provider for testing
-            logger.warning("No LLM API keys found. Using mock provider for testing.")
-            self.llm_provider = MockLLMProvider()
-            
-        except Exception as e:
-            logger.error(f"Failed to setup LLM provider: {e}")
-            self.llm_provider = MockLLMProvider()
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(_CDP_HOST, _CDP_PORT), timeout=_CDP_PROBE_TIMEOUT
+            )
+            writer.close()
+            self._cdp_available = True
+        except (OSError, asyncio.TimeoutError):
+            self._cdp_available = False
+        
+        self._cdp_checked_at = time.monotonic()
+        if not self._cdp_available:
+            logger.info("No existing Chrome on port %s, launching new browsers", _CDP_PORT)
+        return self._cdp_available
     
-    async def create_agents(self, test_cases: List[Dict[str, Any]], config: Dict[str, Any]) -> List[str]:
-        """Create agents for multiple test cases"""
-        agent_ids = []
+    async def attaches_to_existing_chrome(self, config: Dict[str, Any]) -> bool:
+        """Whether agents for this configuration will share the Chrome listening on the CDP port"""
+        return AgentConfig.from_dict(config).use_existing_chrome and await self._probe_cdp()
+    
+    async def create_agents(self, test_cases: List[Dict[str, Any]], config: Dict[str, Any],
+                            max_concurrent_startups: int = 4) -> List[str]:
+        """Create agents for multiple test cases with concurrency control"""
+        semaphore = asyncio.Semaphore(max_concurrent_startups)
+        agent_config = AgentConfig.from_dict(config)
+        cdp_available = agent_config.use_existing_chrome and await self._probe_cdp()
         
-        for test_case in test_cases:
-            try:
-                agent = TestAgent(test_case, config)
-                await agent.create_agent(self.llm_provider)
-                
-                agent_id = f"agent_{test_case['id']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-                self.active_agents[agent_id] = agent
-                agent_ids.append(agent_id)
-                
-                logger.info(f"Created agent {agent_id} for test case: {test_case['name']}")
-                
-            except Exception as e:
-                logger.error(f"Failed to create agent for test case {test_case['id']}: {e}")
+        async def create_with_semaphore(test_case: Dict[str, Any]) -> str:
+            agent = TestAgent(TestCase.from_dict(test_case), agent_config, self.session_pool)
+            async with semaphore:
+                await agent.create_agent(self.llm_provider, cdp_available)
+            return self._register_agent(agent)
+        
+        # Start browsers concurrently but limited by semaphore
+        tasks = [create_with_semaphore(test_case) for test_case in test_cases]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        agent_ids = []
+        for test_case, result in zip(test_cases, results):
+            if isinstance(result, Exception):
+                logger.error("Failed to create agent for test case %s: %s", test_case['id'], result)
                 # Continue with other test cases
+                continue
+            agent_ids.append(result)
         
         return agent_ids
     
+    async def acquire_agent(self, test_case: Dict[str, Any], config: Dict[str, Any]) -> str:
+        """Create a single agent on a pooled browser session and return its id"""
+        agent_config = AgentConfig.from_dict(config)
+        cdp_available = await self.attaches_to_existing_chrome(config)
+        
+        agent = TestAgent(TestCase.from_dict(test_case), agent_config, self.session_pool)
+        await agent.create_agent(self.llm_provider, cdp_available)
+        return self._register_agent(agent)
+    
+    async def release_agent(self, agent_id: str):
+        """Release an agent; its browser session goes back to the pool"""
+        await self.stop_agent(agent_id)
+    
     async def execute_agent(self, agent_id: str) -> Dict[str, Any]:
         """Execute a specific agent"""
         if agent_id not in self.active_agents:
@@ -295,31 +634,35 @@ class BrowserAgentManager:
         return result
     
     async def execute_all_agents(self, agent_ids: List[str], max_concurrent: int = 2) -> List[Dict[str, Any]]:
-        """Execute multiple agents with concurrency control"""
-        semaphore = asyncio.Semaphore(max_concurrent)
+        """Execute multiple agents with a fixed pool of workers"""
+        queue: asyncio.Queue = asyncio.Queue()
+        for index, agent_id in enumerate(agent_ids):
+            queue.put_nowait((index, agent_id))
         
-        async def execute_with_semaphore(agent_id: str):
-            async with semaphore:
-                return await self.execute_agent(agent_id)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(agent_ids)
         
-        # Execute all agents concurrently but limited by semaphore
-        tasks = [execute_with_semaphore(agent_id) for agent_id in agent_ids]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        async def worker():
+            while True:
+                try:
+                    index, agent_id = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                
+                try:
+                    results[index] = await self.execute_agent(agent_id)
+                except Exception as e:
+                    results[index] = {
+                        "agent_id": agent_id,
+                        "status": "error",
+                        "error": str(e),
+                        "timestamp": datetime.now().isoformat()
+                    }
         
-        # Process results and handle exceptions
-        processed_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                processed_results.append({
-                    "agent_id": agent_ids[i],
-                    "status": "error",
-                    "error": str(result),
-                    "timestamp": datetime.now().isoformat()
-                })
-            else:
-                processed_results.append(result)
+        # Only max_concurrent coroutines exist regardless of the number of agents
+        workers = [worker() for _ in range(min(max_concurrent, len(agent_ids)))]
+        await asyncio.gather(*workers)
         
-        return processed_results
+        return results
     
     async def stop_agent(self, agent_id: str):
         """Stop a specific agent"""
@@ -327,13 +670,14 @@ class BrowserAgentManager:
             agent = self.active_agents[agent_id]
             await agent.cleanup()
             del self.active_agents[agent_id]
-            logger.info(f"Stopped agent: {agent_id}")
+            logger.info("Stopped agent: %s", agent_id)
     
     async def stop_all_agents(self):
         """Stop all active agents"""
         agent_ids = list(self.active_agents.keys())
         for agent_id in agent_ids:
             await self.stop_agent(agent_id)
+        await self._session_pool.close_all()
         logger.info("All agents stopped")
 
 class MockLLMProvider:
@@ -1,23 +1,70 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Dict, Any, Optional
-import uvicorn
+from contextlib import asynccontextmanager
+import anyio.to_thread
+import httpx
 import asyncio
+import json
 import logging
 import os
+import time
 from datetime import datetime
 
 from browser_agent import agent_manager
+from session_store import create_session_store
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Worker threads for to_thread/run_in_threadpool (anyio defaults to 40)
+THREAD_LIMIT = 200
+
+async def warm_agent_pool():
+    """Pre-launch browser sessions so the first tests skip Chromium startup"""
+    # AGENT_REUSE=false restores a fresh browser per test
+    agent_manager.set_session_reuse(os.getenv("AGENT_REUSE", "true").lower() == "true")
+    try:
+        await agent_manager.warm_up(
+            int(os.getenv("WARM_POOL_SIZE", 0)),
+            {"headless": os.getenv("BROWSER_HEADLESS", "false").lower() == "true"}
+        )
+    except Exception as e:
+        logger.error(f"Failed to warm browser session pool: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create process-wide resources on startup and release them on shutdown"""
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREAD_LIMIT
+    # One pooled client per event loop for outbound LLM/API traffic
+    app.state.http = httpx.AsyncClient(
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30)
+    )
+    agent_manager.set_http_client(app.state.http)
+    app.state.session_store = sessions
+    app.state.playwright = None
+    await warm_agent_pool()
+    
+    try:
+        yield
+    finally:
+        # Close active agents and pooled browser sessions
+        await agent_manager.stop_all_agents()
+        agent_manager.set_http_client(None)
+        await app.state.http.aclose()
+        await sessions.close()
+        if app.state.playwright is not None:
+            await app.state.playwright.stop()
+
 app = FastAPI(
     title="AI Test Tool Backend",
     description="Backend service for AI-powered web testing using browser-use",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Enable CORS for Electron app communication
@@ -29,8 +76,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON responses (e.g. /test/results); Brotli when brotli-asgi
+# is installed, which also falls back to gzip for clients without br support
+try:
+    from brotli_asgi import BrotliMiddleware
+    app.add_middleware(BrotliMiddleware, minimum_size=1024)
+except ImportError:
+    app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Data models
+# Upper bound for TestConfig.max_parallel
+MAX_PARALLEL_LIMIT = 16
+
+# Shared by the API models: ignore unknown fields and skip optional validation features
+_MODEL_CONFIG = ConfigDict(extra="ignore", frozen=False, validate_assignment=False, arbitrary_types_allowed=False)
+
 class TestCase(BaseModel):
+    model_config = _MODEL_CONFIG
+    
     id: str
     name: str
     description: str
@@ -40,18 +103,26 @@ class TestCase(BaseModel):
     priority: str = "medium"
 
 class TestConfig(BaseModel):
+    model_config = _MODEL_CONFIG
+    
     viewport_width: int = 1920
     viewport_height: int = 1080
     browser_type: str = "chromium"
     headless: bool = False
     timeout: int = 30000
     keep_browser_open: bool = False
+    # Each slot can hold a Chromium process, so keep the upper bound modest
+    max_parallel: int = Field(4, ge=1, le=MAX_PARALLEL_LIMIT)
 
 class TestRequest(BaseModel):
+    model_config = _MODEL_CONFIG
+    
     test_cases: List[TestCase]
     config: TestConfig
 
 class TestResult(BaseModel):
+    model_config = _MODEL_CONFIG
+    
     test_case_id: str
     status: str  # "running", "passed", "failed", "error"
     message: str
@@ -59,10 +130,58 @@ class TestResult(BaseModel):
     execution_time: float = 0.0
     timestamp: str
 
-# In-memory storage for active test sessions
-active_sessions: Dict[str, Dict[str, Any]] = {}
-test_results: Dict[str, List[TestResult]] = {}
+class TestResultsPage(BaseModel):
+    model_config = _MODEL_CONFIG
+    
+    session_id: str
+    results: List[TestResult]
+    next_cursor: int
+    summary: Dict[str, int]
+
+# ISO timestamp reused for calls within the same millisecond
+_iso_clock: List[Any] = [-1, ""]
+_started_at = time.monotonic()
+
+def _now_iso() -> str:
+    """Current local time in ISO format, formatted at most once per millisecond"""
+    now = time.time()
+    # Any change of millisecond refreshes, including when the wall clock steps back
+    ms = int(now * 1000)
+    if ms != _iso_clock[0]:
+        _iso_clock[0] = ms
+        _iso_clock[1] = datetime.fromtimestamp(now).isoformat()
+    return _iso_clock[1]
+
+# Session state lives in the store (Redis when REDIS_URL is set so every
+# worker sees it); agents and tasks are process-bound and stay local
+sessions = create_session_store(os.getenv("REDIS_URL"))
 session_agents: Dict[str, List[str]] = {}  # Maps session_id to agent_ids
+session_tasks: Dict[str, List[asyncio.Task]] = {}  # Maps session_id to running test tasks
+
+def _cancel_session_tasks(session_id: str):
+    """Cancel the test tasks of a session that have not finished yet"""
+    for task in session_tasks.get(session_id, []):
+        if not task.done():
+            task.cancel()
+
+# Wakes /test/stream listeners when this process records a result or status
+# change; a fresh Event per round so every waiter sees each notification
+_session_events: Dict[str, asyncio.Event] = {}
+# Open /test/stream connections per session; the last one to close drops the Event
+_session_listeners: Dict[str, int] = {}
+
+def _notify_session(session_id: str):
+    event = _session_events.pop(session_id, None)
+    if event is not None:
+        event.set()
+
+async def _set_status(session_id: str, status: str):
+    await sessions.set_status(session_id, status)
+    _notify_session(session_id)
+
+async def _record_result(session_id: str, result: TestResult):
+    await sessions.record_result(session_id, result.model_dump())
+    _notify_session(session_id)
 
 @app.get("/")
 async def root():
@@ -83,12 +202,68 @@ async def root():
                 "start": "/test/start",
                 "stop": "/test/stop/{session_id}",
                 "status": "/test/status/{session_id}",
-                "results": "/test/results/{session_id}"
+                "results": "/test/results/{session_id}",
+                "stream": "/test/stream/{session_id}"
             }
         },
         "documentation": "/docs"
     }
 
+# Browser capabilities probe result shared by /health calls for BROWSER_PROBE_TTL seconds
+BROWSER_PROBE_TTL = 30.0
+_browser_probe_cache: Dict[str, Any] = {"ts": 0.0, "status": None}
+_browser_probe_lock = asyncio.Lock()
+
+async def _cached_browser_status(ttl: float = BROWSER_PROBE_TTL) -> str:
+    """Launch a throwaway headless browser at most once per ttl and cache the verdict"""
+    if _browser_probe_cache["status"] is not None and time.monotonic() - _browser_probe_cache["ts"] < ttl:
+        return _browser_probe_cache["status"]
+    
+    # Single flight: concurrent health checks wait for one probe instead of each launching a browser
+    async with _browser_probe_lock:
+        if _browser_probe_cache["status"] is not None and time.monotonic() - _browser_probe_cache["ts"] < ttl:
+            return _browser_probe_cache["status"]
+        
+        try:
+            from browser_use import BrowserSession, BrowserProfile
+            # Quick browser test
+            test_profile = BrowserProfile(headless=True)
+            test_session = BrowserSession(browser_profile=test_profile)
+            await test_session.start()
+            await test_session.close()
+            status = "available"
+        except Exception as browser_error:
+            status = f"error: {str(browser_error)}"
+        
+        _browser_probe_cache["ts"] = time.monotonic()
+        _browser_probe_cache["status"] = status
+        return status
+
+# psutil samples reused between calls; cpu_percent(interval=None) is non-blocking
+# and reports usage since the previous sample (0.0 on the very first call)
+CPU_SAMPLE_INTERVAL = 2.0
+MEMORY_SAMPLE_TTL = 1.0
+_cpu_sample: Dict[str, float] = {"ts": 0.0, "val": 0.0}
+_memory_sample: Dict[str, float] = {"ts": 0.0, "val": 0.0}
+
+def _sample_cpu(min_interval: float = CPU_SAMPLE_INTERVAL) -> float:
+    """System CPU percent, re-sampled at most once per min_interval"""
+    import psutil
+    now = time.monotonic()
+    if now - _cpu_sample["ts"] >= min_interval:
+        _cpu_sample["val"] = psutil.cpu_percent(interval=None)
+        _cpu_sample["ts"] = now
+    return _cpu_sample["val"]
+
+def _sample_memory(ttl: float = MEMORY_SAMPLE_TTL) -> float:
+    """System memory percent, re-sampled at most once per ttl"""
+    import psutil
+    now = time.monotonic()
+    if now - _memory_sample["ts"] >= ttl:
+        _memory_sample["val"] = psutil.virtual_memory().percent
+        _memory_sample["ts"] = now
+    return _memory_sample["val"]
+
 @app.get("/health")
 async def health_check():
     """Enhanced health check endpoint"""
@@ -101,26 +276,16 @@ async def health_check():
         llm_status = "available" if agent_manager.llm_provider else "not_configured"
         llm_type = type(agent_manager.llm_provider).__name__ if agent_manager.llm_provider else "None"
         
-        # System resources check
-        import psutil
-        memory_usage = psutil.virtual_memory().percent
-        cpu_usage = psutil.cpu_percent(interval=1)
+        # Browser capabilities check (cached probe)
+        browser_status = await _cached_browser_status()
         
-        # Browser capabilities check
-        browser_status = "available"
-        try:
-            from browser_use import BrowserSession, BrowserProfile
-            # Quick browser test
-            test_profile = BrowserProfile(headless=True)
-            test_session = BrowserSession(browser_profile=test_profile)
-            await test_session.start()
-            await test_session.close()
-        except Exception as browser_error:
-            browser_status = f"error: {str(browser_error)}"
+        # System resources check
+        memory_usage = _sample_memory()
+        cpu_usage = _sample_cpu()
         
         health_data = {
             "status": "healthy",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "services": {
                 "browser_use": "available",
                 "playwright": "available", 
@@ -132,7 +297,7 @@ async def health_check():
                 "cpu_usage_percent": cpu_usage
             },
             "application": {
-                "active_sessions": len(active_sessions),
+                "active_sessions": await sessions.count(),
                 "active_agents": len(agent_manager.active_agents),
                 "llm_provider_type": llm_type
             }
@@ -148,7 +313,7 @@ async def health_check():
         logger.error(f"Health check failed: {e}")
         return {
             "status": "unhealthy",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "error": str(e),
             "services": {
                 "browser_use": "unknown",
@@ -157,89 +322,100 @@ async def health_check():
             }
         }
 
+# /service/initialize result, reused for INIT_CACHE_TTL seconds since the
+# frontend calls it repeatedly and each run launches Chromium
+INIT_CACHE_TTL = 60.0
+_init_cache: Dict[str, Any] = {"result": None, "ts": 0.0}
+_init_lock = asyncio.Lock()
+
+async def _init_browser_use() -> Dict[str, Any]:
+    import browser_use
+    from browser_use import BrowserSession, BrowserProfile
+    
+    # Test browser session creation
+    test_profile = BrowserProfile(headless=True)
+    test_session = BrowserSession(browser_profile=test_profile)
+    await test_session.start()
+    await test_session.close()
+    
+    return {
+        "status": "initialized",
+        "version": getattr(browser_use, "__version__", "unknown")
+    }
+
+async def _init_llm(refresh: bool = False) -> Dict[str, Any]:
+    # refresh re-reads the API keys; provider setup builds SDK clients, so run it off the loop
+    await asyncio.to_thread(agent_manager._setup_llm_provider, refresh)
+    return {
+        "status": "initialized" if agent_manager.llm_provider else "not_configured",
+        "type": type(agent_manager.llm_provider).__name__,
+        "available": agent_manager.llm_provider is not None
+    }
+
+async def _init_playwright() -> Dict[str, Any]:
+    # One Playwright driver per process, started on first use and stopped in lifespan
+    if app.state.playwright is None:
+        from playwright.async_api import async_playwright
+        app.state.playwright = await async_playwright().start()
+    
+    # Test playwright installation
+    browser = await app.state.playwright.chromium.launch(headless=True)
+    await browser.close()
+    
+    return {
+        "status": "initialized",
+        "browsers": ["chromium", "firefox", "webkit"]
+    }
+
+async def _check_env() -> Dict[str, Any]:
+    required_env_vars = ["GOOGLE_API_KEY", "OPENAI_API_KEY", "ANTHROPIC_API_KEY"]
+    env_status = {var: "set" if os.getenv(var) else "not_set" for var in required_env_vars}
+    return {
+        "status": "checked",
+        "variables": env_status,
+        "api_keys_available": any(os.getenv(var) for var in required_env_vars)
+    }
+
+def _init_cache_hit() -> Optional[Dict[str, Any]]:
+    result = _init_cache["result"]
+    if result is not None and time.monotonic() - _init_cache["ts"] < INIT_CACHE_TTL:
+        return result
+    return None
+
 @app.post("/service/initialize")
-async def initialize_service():
+async def initialize_service(force: bool = False):
     """Initialize and validate all service components"""
+    cached = None if force else _init_cache_hit()
+    if cached is not None:
+        return cached
+    
     try:
-        initialization_results = {
-            "timestamp": datetime.now().isoformat(),
-            "components": {},
-            "status": "success"
-        }
-        
-        # Initialize browser-use
-        try:
-            import browser_use
-            from browser_use import BrowserSession, BrowserProfile
+        async with _init_lock:
+            # Another request may have finished initializing while we waited
+            cached = None if force else _init_cache_hit()
+            if cached is not None:
+                return cached
             
-            # Test browser session creation
-            test_profile = BrowserProfile(headless=True)
-            test_session = BrowserSession(browser_profile=test_profile)
-            await test_session.start()
-            await test_session.close()
-            
-            initialization_results["components"]["browser_use"] = {
-                "status": "initialized",
-                "version": getattr(browser_use, "__version__", "unknown")
+            initialization_results = {
+                "timestamp": _now_iso(),
+                "components": {},
+                "status": "success"
             }
-        except Exception as e:
-            initialization_results["components"]["browser_use"] = {
-                "status": "failed",
-                "error": str(e)
-            }
-            initialization_results["status"] = "partial"
-        
-        # Initialize LLM provider
-        try:
-            agent_manager._setup_llm_provider()
-            llm_type = type(agent_manager.llm_provider).__name__
             
-            initialization_results["components"]["llm_provider"] = {
-                "status": "initialized" if agent_manager.llm_provider else "not_configured",
-                "type": llm_type,
-                "available": agent_manager.llm_provider is not None
-            }
-        except Exception as e:
-            initialization_results["components"]["llm_provider"] = {
-                "status": "failed",
-                "error": str(e)
-            }
-            initialization_results["status"] = "partial"
-        
-        # Initialize Playwright browsers
-        try:
-            import playwright
-            from playwright.async_api import async_playwright
+            # Component checks are independent, so run them concurrently
+            names = ("browser_use", "llm_provider", "playwright", "environment")
+            outcomes = await asyncio.gather(
+                _init_browser_use(), _init_llm(refresh=force), _init_playwright(), _check_env(),
+                return_exceptions=True
+            )
+            for name, outcome in zip(names, outcomes):
+                if isinstance(outcome, Exception):
+                    outcome = {"status": "failed", "error": str(outcome)}
+                    initialization_results["status"] = "partial"
+                initialization_results["components"][name] = outcome
             
-            # Test playwright installation
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                await browser.close()
-            
-            initialization_results["components"]["playwright"] = {
-                "status": "initialized",
-                "browsers": ["chromium", "firefox", "webkit"]
-            }
-        except Exception as e:
-            initialization_results["components"]["playwright"] = {
-                "status": "failed",
-                "error": str(e)
-            }
-            initialization_results["status"] = "partial"
-        
-        # Check environment variables
-        env_status = {}
-        required_env_vars = ["GOOGLE_API_KEY", "OPENAI_API_KEY", "ANTHROPIC_API_KEY"]
-        for var in required_env_vars:
-            env_status[var] = "set" if os.getenv(var) else "not_set"
-        
-        initialization_results["components"]["environment"] = {
-            "status": "checked",
-            "variables": env_status,
-            "api_keys_available": any(os.getenv(var) for var in required_env_vars)
-        }
-        
-        return initialization_results
+            _init_cache.update(result=initialization_results, ts=time.monotonic())
+            return initialization_results
         
     except Exception as e:
         logger.error(f"Service initialization failed: {e}")
@@ -250,16 +426,18 @@ async def reset_service():
     """Reset service state and clean up resources"""
     try:
         reset_results = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "actions": [],
             "status": "success"
         }
         
         # Stop all active sessions
-        if active_sessions:
-            for session_id in list(active_sessions.keys()):
+        session_ids = await sessions.list_ids()
+        if session_ids:
+            for session_id in session_ids:
                 try:
-                    active_sessions[session_id]["status"] = "stopped"
+                    await _set_status(session_id, "stopped")
+                    _cancel_session_tasks(session_id)
                     reset_results["actions"].append(f"Stopped session: {session_id}")
                 except Exception as e:
                     reset_results["actions"].append(f"Error stopping session {session_id}: {str(e)}")
@@ -272,14 +450,16 @@ async def reset_service():
             reset_results["actions"].append(f"Error stopping agents: {str(e)}")
         
         # Clear session data
-        active_sessions.clear()
-        test_results.clear()
+        await sessions.clear()
         session_agents.clear()
+        _session_events.clear()
+        _init_cache["result"] = None
         reset_results["actions"].append("Cleared session data")
         
         # Reinitialize LLM provider
         try:
-            agent_manager._setup_llm_provider()
+            # Rebuilding the provider imports and constructs SDK clients; keep it off the loop
+            await asyncio.to_thread(agent_manager._setup_llm_provider, True)
             reset_results["actions"].append("Reinitialized LLM provider")
         except Exception as e:
             reset_results["actions"].append(f"Error reinitializing LLM provider: {str(e)}")
@@ -294,25 +474,31 @@ async def reset_service():
 async def service_status():
     """Get detailed service status and statistics"""
     try:
+        stats = await sessions.stats()
         return {
-            "timestamp": datetime.now().isoformat(),
-            "uptime_seconds": (datetime.now() - datetime.now()).total_seconds(),  # Placeholder
+            "timestamp": _now_iso(),
+            "uptime_seconds": time.monotonic() - _started_at,
             "sessions": {
-                "active": len(active_sessions),
-                "total_created": len(active_sessions) + len([s for s in active_sessions.values() if s.get("status") == "completed"]),
-                "session_list": list(active_sessions.keys())
+                "active": stats["active"],
+                "total_created": stats["total_created"],
+                "by_status": stats["by_status"],
+                "session_list": stats["session_list"]
             },
             "agents": {
                 "active": len(agent_manager.active_agents),
                 "agent_list": list(agent_manager.active_agents.keys())
             },
             "test_results": {
-                "total_sessions_with_results": len(test_results),
-                "total_test_results": sum(len(results) for results in test_results.values())
+                "total_sessions_with_results": stats["sessions_with_results"],
+                "total_test_results": stats["total_test_results"]
             },
             "llm_provider": {
                 "type": type(agent_manager.llm_provider).__name__ if agent_manager.llm_provider else "None",
                 "available": agent_manager.llm_provider is not None
+            },
+            "system": {
+                "memory_usage_percent": _sample_memory(),
+                "cpu_usage_percent": _sample_cpu()
             }
         }
     except Exception as e:
@@ -323,22 +509,24 @@ async def service_status():
 async def start_test(request: TestRequest):
     """Start a new test session"""
     try:
-        session_id = f"session_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+        session_id = f"session_{time.time_ns()}"
+        
+        # Serialize the request once; execute_tests reuses the same dicts
+        test_case_dicts = [tc.model_dump() for tc in request.test_cases]
+        config_dict = request.config.model_dump()
         
         # Store session data
-        active_sessions[session_id] = {
+        await sessions.create(session_id, {
             "status": "initialized",
-            "test_cases": [tc.dict() for tc in request.test_cases],
-            "config": request.config.dict(),
-            "created_at": datetime.now().isoformat(),
+            "test_cases": test_case_dicts,
+            "config": config_dict,
+            "created_at": _now_iso(),
             "total_tests": len(request.test_cases),
             "completed_tests": 0
-        }
-        
-        test_results[session_id] = []
+        })
         
         # Start test execution in background
-        asyncio.create_task(execute_tests(session_id, request))
+        asyncio.create_task(execute_tests(session_id, test_case_dicts, config_dict))
         
         return {
             "session_id": session_id,
@@ -354,12 +542,10 @@ async def start_test(request: TestRequest):
 @app.get("/test/status/{session_id}")
 async def get_test_status(session_id: str):
     """Get status of a test session"""
-    if session_id not in active_sessions:
+    session = await sessions.get(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session = active_sessions[session_id]
-    results = test_results.get(session_id, [])
-    
     return {
         "session_id": session_id,
         "status": session["status"],
@@ -367,33 +553,87 @@ async def get_test_status(session_id: str):
         "completed_tests": session["completed_tests"],
         "progress_percentage": (session["completed_tests"] / session["total_tests"]) * 100 if session["total_tests"] > 0 else 0,
         "created_at": session["created_at"],
-        "latest_results": results[-5:] if results else []  # Last 5 results
+        "latest_results": await sessions.get_latest_results(session_id, 5)  # Last 5 results
     }
 
-@app.get("/test/results/{session_id}")
-async def get_test_results(session_id: str):
-    """Get all results for a test session"""
-    if session_id not in test_results:
+# Declared response model: FastAPI serializes it straight to JSON bytes via pydantic-core
+@app.get("/test/results/{session_id}", response_model=TestResultsPage)
+async def get_test_results(
+    session_id: str,
+    after: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """Get a page of results for a test session; pass next_cursor as after for the next page"""
+    if not await sessions.has_results(session_id):
         raise HTTPException(status_code=404, detail="Session results not found")
     
+    results = await sessions.get_results(session_id, after, limit)
     return {
         "session_id": session_id,
-        "results": test_results[session_id],
-        "summary": {
-            "total": len(test_results[session_id]),
-            "passed": len([r for r in test_results[session_id] if r.status == "passed"]),
-            "failed": len([r for r in test_results[session_id] if r.status == "failed"]),
-            "errors": len([r for r in test_results[session_id] if r.status == "error"])
-        }
+        "results": results,
+        "next_cursor": after + len(results),
+        "summary": await sessions.get_summary(session_id)
     }
 
+# Final session states after which /test/stream closes
+FINISHED_STATUSES = ("completed", "error", "stopped")
+# Stream listeners also recheck the store this often, which picks up results
+# recorded by other workers and keeps idle connections alive
+STREAM_RECHECK_INTERVAL = 15.0
+
+async def _session_event_stream(session_id: str):
+    """Server-sent events: one "result" per recorded result, then "end" with the summary"""
+    cursor = 0
+    _session_listeners[session_id] = _session_listeners.get(session_id, 0) + 1
+    try:
+        while True:
+            event = _session_events.setdefault(session_id, asyncio.Event())
+            # Status first: results recorded before a final status are then all visible below
+            status = await sessions.get_status(session_id)
+            if status is None:
+                return
+            
+            results = await sessions.get_results(session_id, cursor)
+            for result in results:
+                yield f"event: result\ndata: {json.dumps(result)}\n\n"
+            cursor += len(results)
+            
+            if status in FINISHED_STATUSES:
+                end = {"status": status, "summary": await sessions.get_summary(session_id)}
+                yield f"event: end\ndata: {json.dumps(end)}\n\n"
+                return
+            
+            try:
+                await asyncio.wait_for(event.wait(), STREAM_RECHECK_INTERVAL)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+    finally:
+        remaining = _session_listeners.pop(session_id, 1) - 1
+        if remaining:
+            _session_listeners[session_id] = remaining
+        else:
+            _session_events.pop(session_id, None)
+
+@app.get("/test/stream/{session_id}")
+async def stream_test_results(session_id: str):
+    """Stream results of a test session as server-sent events until it finishes"""
+    if await sessions.get_status(session_id) is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    return StreamingResponse(
+        _session_event_stream(session_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/test/stop/{session_id}")
 async def stop_test(session_id: str):
     """Stop a running test session"""
-    if session_id not in active_sessions:
+    if await sessions.get_status(session_id) is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    active_sessions[session_id]["status"] = "stopped"
+    await _set_status(session_id, "stopped")
+    _cancel_session_tasks(session_id)
     
     return {
         "session_id": session_id,
@@ -401,90 +641,96 @@ async def stop_test(session_id: str):
         "message": "Test session stopped successfully"
     }
 
-async def execute_tests(session_id: str, request: TestRequest):
+async def execute_tests(session_id: str, test_case_dicts: List[Dict[str, Any]], config_dict: Dict[str, Any]):
     """Execute tests using browser-use agents"""
     try:
-        active_sessions[session_id]["status"] = "running"
+        await _set_status(session_id, "running")
         
-        # Create agents for all test cases
-        test_case_dicts = [tc.dict() for tc in request.test_cases]
-        config_dict = request.config.dict()
+        # Agents are acquired per test once a slot is free, so at most
+        # max_parallel browsers are in use and sessions are recycled via the pool
+        agent_ids = session_agents[session_id] = []
+        total = len(test_case_dicts)
+        max_parallel = config_dict.get("max_parallel", 4)
+        # Agents attached over CDP all drive the one existing Chrome, so run them one at a time
+        if await agent_manager.attaches_to_existing_chrome(config_dict):
+            max_parallel = 1
+        semaphore = asyncio.Semaphore(max_parallel)
+        # Bound once and captured by every _run_one closure
+        get_status = sessions.get_status
+        log_info = logger.info
         
-        agent_ids = await agent_manager.create_agents(test_case_dicts, config_dict)
-        session_agents[session_id] = agent_ids
-        
-        logger.info(f"Created {len(agent_ids)} agents for session {session_id}")
-        
-        # Execute tests sequentially for now (can be made concurrent later)
-        for i, agent_id in enumerate(agent_ids):
-            if active_sessions[session_id]["status"] == "stopped":
-                break
-            
-            try:
-                logger.info(f"Session {session_id}: Starting test {i+1}/{len(agent_ids)}")
-                
-                # Execute the agent
-                agent_result = await agent_manager.execute_agent(agent_id)
-                
-                # Convert to TestResult format
-                result = TestResult(
-                    test_case_id=agent_result.get("test_case_id", f"test_{i}"),
-                    status="passed" if agent_result.get("status") == "completed" else "failed",
-                    message=agent_result.get("summary", "Test completed"),
-                    execution_time=agent_result.get("execution_time", 0.0),
-                    timestamp=agent_result.get("timestamp", datetime.now().isoformat())
-                )
-                
-                test_results[session_id].append(result)
-                active_sessions[session_id]["completed_tests"] = i + 1
-                
-                logger.info(f"Session {session_id}: Completed test {i+1}/{len(agent_ids)}")
+        async def _run_one(i: int, test_case: Dict[str, Any]):
+            async with semaphore:
+                # One status read per test, once a slot is free; a local stop
+                # cancels waiting tasks, so an earlier check only adds a store round trip
+                if await get_status(session_id) == "stopped":
+                    return
                 
-            except Exception as e:
-                logger.error(f"Test execution failed for agent {agent_id}: {e}")
-                
-                # Create error result
-                error_result = TestResult(
-                    test_case_id=test_case_dicts[i].get("id", f"test_{i}"),
-                    status="error",
-                    message=f"Test execution failed: {str(e)}",
-                    execution_time=0.0,
-                    timestamp=datetime.now().isoformat()
-                )
+                agent_id = None
+                try:
+                    log_info(f"Session {session_id}: Starting test {i+1}/{total}")
+                    
+                    agent_id = await agent_manager.acquire_agent(test_case, config_dict)
+                    agent_ids.append(agent_id)
+                    
+                    # Execute the agent
+                    agent_result = await agent_manager.execute_agent(agent_id)
+                    
+                    # Convert to TestResult format; validated because the message
+                    # comes from browser-use and may not be a str
+                    result = TestResult(
+                        test_case_id=agent_result.get("test_case_id", f"test_{i}"),
+                        status="passed" if agent_result.get("status") == "completed" else "failed",
+                        message=agent_result.get("summary", "Test completed"),
+                        execution_time=agent_result.get("execution_time", 0.0),
+                        timestamp=agent_result.get("timestamp") or _now_iso()
+                    )
+                    
+                    await _record_result(session_id, result)
+                    
+                    log_info(f"Session {session_id}: Completed test {i+1}/{total}")
+                    
+                except Exception as e:
+                    logger.error(f"Test execution failed for agent {agent_id}: {e}")
+                    
+                    # Create error result; every field is built here, so skip validation
+                    error_result = TestResult.model_construct(
+                        test_case_id=test_case.get("id", f"test_{i}"),
+                        status="error",
+                        message=f"Test execution failed: {str(e)}",
+                        execution_time=0.0,
+                        timestamp=_now_iso()
+                    )
+                    
+                    await _record_result(session_id, error_result)
                 
-                test_results[session_id].append(error_result)
-                active_sessions[session_id]["completed_tests"] = i + 1
+                finally:
+                    if agent_id is not None:
+                        await agent_manager.release_agent(agent_id)
+        
+        tasks = [asyncio.create_task(_run_one(i, test_case)) for i, test_case in enumerate(test_case_dicts)]
+        session_tasks[session_id] = tasks
+        await asyncio.gather(*tasks, return_exceptions=True)
         
         # Mark session as completed
-        if active_sessions[session_id]["status"] != "stopped":
-            active_sessions[session_id]["status"] = "completed"
+        if await get_status(session_id) != "stopped":
+            await _set_status(session_id, "completed")
             
-        logger.info(f"Session {session_id} completed with {len(test_results[session_id])} results")
+        summary = await sessions.get_summary(session_id)
+        logger.info(f"Session {session_id} completed with {summary['total']} results")
             
     except Exception as e:
         logger.error(f"Test execution failed for session {session_id}: {e}")
-        active_sessions[session_id]["status"] = "error"
+        await _set_status(session_id, "error")
     
     finally:
-        # Clean up agents
+        session_tasks.pop(session_id, None)
+        
+        # Release agents left behind by cancelled tests
         if session_id in session_agents:
             for agent_id in session_agents[session_id]:
                 try:
-                    await agent_manager.stop_agent(agent_id)
+                    await agent_manager.release_agent(agent_id)
                 except Exception as e:
                     logger.error(f"Error stopping agent {agent_id}: {e}")
             del session_agents[session_id]
-
-if __name__ == "__main__":
-    port = int(os.getenv("PORT", 8000))
-    host = os.getenv("HOST", "localhost")
-    
-    logger.info(f"Starting AI Test Tool Backend on {host}:{port}")
-    
-    uvicorn.run(
-        "server:app",
-        host=host,
-        port=port,
-        reload=True,
-        log_level="info"
-    )
\ No newline at end of file
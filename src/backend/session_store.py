@@ -0,0 +1,267 @@
+"""
+Test session storage shared by the API handlers
+
+InMemorySessionStore keeps everything in the current process (single uvicorn
+worker). RedisSessionStore keeps the same data in Redis so that several
+workers can serve status/results for sessions started on another worker.
+"""
+
+import json
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+# Fields stored as JSON strings in the Redis session hash
+_JSON_FIELDS = ("test_cases", "config")
+_INT_FIELDS = ("total_tests", "completed_tests")
+
+# Atomic status transition: read the old status, move the per-status counters
+# and write the new status in one step so concurrent transitions cannot drift.
+# Sessions that no longer exist (e.g. cleared by a reset) are left alone
+_SET_STATUS_SCRIPT = """
+local old = redis.call('HGET', KEYS[1], 'status')
+if not old then
+    return false
+end
+if old ~= ARGV[1] then
+    redis.call('HSET', KEYS[1], 'status', ARGV[1])
+    redis.call('HINCRBY', KEYS[2], old, -1)
+    redis.call('HINCRBY', KEYS[2], ARGV[1], 1)
+end
+return old
+"""
+
+
+class SessionResults:
+    """Results of one session with per-status counters kept up to date on append"""
+
+    def __init__(self):
+        self.results: List[Dict[str, Any]] = []
+        self.counts: Dict[str, int] = {"passed": 0, "failed": 0, "error": 0}
+
+    def append(self, result: Dict[str, Any]):
+        self.results.append(result)
+        self.counts[result["status"]] = self.counts.get(result["status"], 0) + 1
+
+    def summary(self) -> Dict[str, int]:
+        return _summary(len(self.results), self.counts)
+
+
+def _summary(total: int, counts: Dict[str, int]) -> Dict[str, int]:
+    return {
+        "total": total,
+        "passed": counts.get("passed", 0),
+        "failed": counts.get("failed", 0),
+        "errors": counts.get("error", 0)
+    }
+
+
+class InMemorySessionStore:
+    """Session store backed by process-local dicts"""
+
+    def __init__(self):
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._results: Dict[str, SessionResults] = {}
+        # Running totals so status endpoints never rescan the stores above
+        self._status_counts: Counter = Counter()
+        self._totals: Dict[str, int] = {"created": 0, "test_results": 0}
+
+    async def create(self, session_id: str, session: Dict[str, Any]):
+        self._sessions[session_id] = session
+        self._results[session_id] = SessionResults()
+        self._status_counts[session["status"]] += 1
+        self._totals["created"] += 1
+
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        return self._sessions.get(session_id)
+
+    async def get_status(self, session_id: str) -> Optional[str]:
+        session = self._sessions.get(session_id)
+        return session["status"] if session else None
+
+    async def set_status(self, session_id: str, status: str):
+        """Change a session's status and keep the per-status counters in sync"""
+        session = self._sessions[session_id]
+        self._status_counts[session["status"]] -= 1
+        self._status_counts[status] += 1
+        session["status"] = status
+
+    async def record_result(self, session_id: str, result: Dict[str, Any]):
+        self._results[session_id].append(result)
+        self._sessions[session_id]["completed_tests"] += 1
+        self._totals["test_results"] += 1
+
+    async def has_results(self, session_id: str) -> bool:
+        return session_id in self._results
+
+    async def get_results(self, session_id: str, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        results = self._results[session_id].results
+        return results[offset:] if limit is None else results[offset:offset + limit]
+
+    async def get_latest_results(self, session_id: str, count: int) -> List[Dict[str, Any]]:
+        session_results = self._results.get(session_id)
+        return session_results.results[-count:] if session_results else []
+
+    async def get_summary(self, session_id: str) -> Dict[str, int]:
+        return self._results[session_id].summary()
+
+    async def list_ids(self) -> List[str]:
+        return list(self._sessions)
+
+    async def count(self) -> int:
+        return len(self._sessions)
+
+    async def stats(self) -> Dict[str, Any]:
+        return {
+            "active": len(self._sessions),
+            "total_created": self._totals["created"],
+            "by_status": {status: count for status, count in self._status_counts.items() if count},
+            "session_list": list(self._sessions),
+            "sessions_with_results": len(self._results),
+            "total_test_results": self._totals["test_results"]
+        }
+
+    async def clear(self):
+        self._sessions.clear()
+        self._results.clear()
+        self._status_counts.clear()
+        self._totals.update(created=0, test_results=0)
+
+    async def close(self):
+        pass
+
+
+class RedisSessionStore:
+    """Session store backed by Redis, shared by every uvicorn worker
+
+    Keys: sess:{id} (hash), res:{id} (list of JSON results), rescount:{id}
+    (hash of per-status counts), sessions (set of ids), stats and
+    status_counts (hashes of running totals).
+    """
+
+    def __init__(self, redis, read_ttl: float = 0.5):
+        self.redis = redis
+        # Short-lived local copy of session hashes so frequent polls skip a round trip
+        self.read_ttl = read_ttl
+        self._read_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._set_status_script = redis.register_script(_SET_STATUS_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisSessionStore":
+        import redis.asyncio
+        return cls(redis.asyncio.Redis.from_url(url, decode_responses=True))
+
+    @staticmethod
+    def _encode(session: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            key: json.dumps(value) if key in _JSON_FIELDS else str(value)
+            for key, value in session.items()
+        }
+
+    @staticmethod
+    def _decode(raw: Dict[str, str]) -> Dict[str, Any]:
+        session: Dict[str, Any] = dict(raw)
+        for key in _JSON_FIELDS:
+            if key in session:
+                session[key] = json.loads(session[key])
+        for key in _INT_FIELDS:
+            if key in session:
+                session[key] = int(session[key])
+        return session
+
+    async def create(self, session_id: str, session: Dict[str, Any]):
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(f"sess:{session_id}", mapping=self._encode(session))
+            pipe.sadd("sessions", session_id)
+            pipe.hincrby("status_counts", session["status"], 1)
+            pipe.hincrby("stats", "created", 1)
+            await pipe.execute()
+
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        cached = self._read_cache.get(session_id)
+        if cached is not None and time.monotonic() - cached[0] < self.read_ttl:
+            return cached[1]
+
+        raw = await self.redis.hgetall(f"sess:{session_id}")
+        if not raw:
+            self._read_cache.pop(session_id, None)
+            return None
+        session = self._decode(raw)
+        self._read_cache[session_id] = (time.monotonic(), session)
+        return session
+
+    async def get_status(self, session_id: str) -> Optional[str]:
+        # Not cached: workers poll this to notice a stop issued elsewhere
+        return await self.redis.hget(f"sess:{session_id}", "status")
+
+    async def set_status(self, session_id: str, status: str):
+        await self._set_status_script(keys=[f"sess:{session_id}", "status_counts"], args=[status])
+        self._read_cache.pop(session_id, None)
+
+    async def record_result(self, session_id: str, result: Dict[str, Any]):
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.rpush(f"res:{session_id}", json.dumps(result))
+            pipe.hincrby(f"rescount:{session_id}", result["status"], 1)
+            pipe.hincrby(f"sess:{session_id}", "completed_tests", 1)
+            pipe.hincrby("stats", "test_results", 1)
+            await pipe.execute()
+        self._read_cache.pop(session_id, None)
+
+    async def has_results(self, session_id: str) -> bool:
+        # Results exist (possibly empty) for every created session
+        return bool(await self.redis.sismember("sessions", session_id))
+
+    async def get_results(self, session_id: str, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        if limit is not None and limit <= 0:
+            return []
+        end = -1 if limit is None else offset + limit - 1
+        return [json.loads(item) for item in await self.redis.lrange(f"res:{session_id}", offset, end)]
+
+    async def get_latest_results(self, session_id: str, count: int) -> List[Dict[str, Any]]:
+        return [json.loads(item) for item in await self.redis.lrange(f"res:{session_id}", -count, -1)]
+
+    async def get_summary(self, session_id: str) -> Dict[str, int]:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.llen(f"res:{session_id}")
+            pipe.hgetall(f"rescount:{session_id}")
+            total, counts = await pipe.execute()
+        return _summary(total, {status: int(count) for status, count in counts.items()})
+
+    async def list_ids(self) -> List[str]:
+        return list(await self.redis.smembers("sessions"))
+
+    async def count(self) -> int:
+        return await self.redis.scard("sessions")
+
+    async def stats(self) -> Dict[str, Any]:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.smembers("sessions")
+            pipe.hgetall("stats")
+            pipe.hgetall("status_counts")
+            session_ids, totals, status_counts = await pipe.execute()
+        return {
+            "active": len(session_ids),
+            "total_created": int(totals.get("created", 0)),
+            "by_status": {status: int(count) for status, count in status_counts.items() if int(count)},
+            "session_list": list(session_ids),
+            "sessions_with_results": len(session_ids),
+            "total_test_results": int(totals.get("test_results", 0))
+        }
+
+    async def clear(self):
+        session_ids = await self.redis.smembers("sessions")
+        keys = ["sessions", "stats", "status_counts"]
+        for session_id in session_ids:
+            keys.extend((f"sess:{session_id}", f"res:{session_id}", f"rescount:{session_id}"))
+        await self.redis.delete(*keys)
+        self._read_cache.clear()
+
+    async def close(self):
+        await self.redis.aclose()
+
+
+def create_session_store(redis_url: Optional[str] = None):
+    """Redis-backed store when redis_url is set, otherwise process-local"""
+    if redis_url:
+        return RedisSessionStore.from_url(redis_url)
+    return InMemorySessionStore()
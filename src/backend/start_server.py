@@ -32,19 +32,6 @@ def setup_environment():
     os.environ.setdefault("PORT", "8000")
     os.environ.setdefault("BROWSER_HEADLESS", "false")
     
-def check_dependencies():
-    """Check if required dependencies are available"""
-    try:
-        import browser_use
-        import fastapi
-        import uvicorn
-        print("✅ All required dependencies are available")
-        return True
-    except ImportError as e:
-        print(f"❌ Missing dependency: {e}")
-        print("Please install dependencies with: pip install browser-use fastapi uvicorn")
-        return False
-
 def main():
     """Main startup function"""
     print("🚀 Starting AI Test Tool Backend Server...")
@@ -52,28 +39,34 @@ def main():
     # Setup environment
     setup_environment()
     
-    # Check dependencies
-    if not check_dependencies():
-        sys.exit(1)
-    
-    # Import and start server
+    # Start server; uvicorn imports server:app itself, so it is not imported here
     try:
-        from server import app
         import uvicorn
         
         host = os.getenv("HOST", "localhost")
         port = int(os.getenv("PORT", 8000))
+        reload = os.getenv("RELOAD", "false").lower() == "true"
+        # Sessions are per-process unless REDIS_URL is set, so keep WORKERS=1 without it
+        workers = int(os.getenv("WORKERS", 1))
         
         print(f"📡 Server starting on http://{host}:{port}")
         print(f"📋 API documentation available at http://{host}:{port}/docs")
         print("🛑 Press Ctrl+C to stop the server")
         
         uvicorn.run(
-            app,
+            "server:app",
             host=host,
             port=port,
-            reload=True,
-            log_level="info"
+            app_dir=str(backend_dir),
+            reload=reload,
+            # Watch only the backend sources when reloading
+            reload_dirs=[str(backend_dir)] if reload else None,
+            workers=1 if reload else workers,
+            # The reloader's child process does not get on with uvloop's policy; use asyncio there
+            loop="asyncio" if reload or sys.platform == "win32" else "uvloop",
+            http="httptools",
+            log_level="info",
+            access_log=False
         )
         
     except KeyboardInterrupt:
@@ -1541,14 +1541,22 @@ Check that the footer contains copyright information`;
             if (statusData.status === 'completed' || statusData.status === 'error' || statusData.status === 'stopped') {
               clearInterval(pollInterval);
               
-              // Get final results
-              const resultsResponse = await window.electronAPI.httpRequest(`http://127.0.0.1:8000/test/results/${sessionId}`);
+              // Get final results, following next_cursor until every page is read
+              let resultsResponse = await window.electronAPI.httpRequest(`http://127.0.0.1:8000/test/results/${sessionId}`);
+              const allResults = resultsResponse.ok ? [...resultsResponse.data.results] : [];
+              while (resultsResponse.ok && resultsResponse.data.results.length > 0 && allResults.length < resultsResponse.data.summary.total) {
+                resultsResponse = await window.electronAPI.httpRequest(`http://127.0.0.1:8000/test/results/${sessionId}?after=${resultsResponse.data.next_cursor}`);
+                if (resultsResponse.ok) {
+                  allResults.push(...resultsResponse.data.results);
+                }
+              }
               if (resultsResponse.ok) {
                 const resultsData = resultsResponse.data;
                 
-                // Process each test result
-                resultsData.results.forEach((result, index) => {
-                  const testDescription = testCases[index]?.description || `Test ${index + 1}`;
+                // Tests run concurrently and results arrive in completion order, so match them by id
+                const testCasesById = new Map(testCases.map(testCase => [testCase.id, testCase]));
+                allResults.forEach((result, index) => {
+                  const testDescription = testCasesById.get(result.test_case_id)?.description || `Test ${index + 1}`;
                   const status = result.status === 'passed' ? 'passed' : 'failed';
                   const message = result.message || (status === 'passed' ? 'Test completed successfully' : 'Test failed');
                   
@@ -1582,7 +1590,7 @@ Check that the footer contains copyright information`;
 
     } catch (error) {
       addResult('Connection failed', 'failed', `Could not connect to backend: ${error.message}`);
-      addResult('Tip', 'info', 'Make sure the backend is running with: python src/backend/server.py');
+      addResult('Tip', 'info', 'Make sure the backend is running with: python src/backend/start_server.py');
       setIsRunning(false);
     }
   };
@@ -9,10 +9,13 @@ import time
 
 BASE_URL = "http://localhost:8000"
 
+# One pooled session so every check reuses the same keep-alive connection
+http = requests.Session()
+
 def test_health():
     """Test health endpoint"""
     try:
-        response = requests.get(f"{BASE_URL}/health", timeout=5)
+        response = http.get(f"{BASE_URL}/health", timeout=5)
         print(f"✅ Health check: {response.status_code}")
         print(f"   Response: {response.json()}")
         return True
@@ -23,7 +26,7 @@ def test_health():
 def test_root():
     """Test root endpoint"""
     try:
-        response = requests.get(f"{BASE_URL}/", timeout=5)
+        response = http.get(f"{BASE_URL}/", timeout=5)
         print(f"✅ Root endpoint: {response.status_code}")
         print(f"   Response: {response.json()}")
         return True
@@ -54,7 +57,7 @@ def test_start_session():
             }
         }
         
-        response = requests.post(f"{BASE_URL}/test/start", json=test_data, timeout=10)
+        response = http.post(f"{BASE_URL}/test/start", json=test_data, timeout=10)
         print(f"✅ Start test session: {response.status_code}")
         
         if response.status_code == 200:
@@ -72,7 +75,7 @@ def test_start_session():
 def test_service_initialize():
     """Test service initialization"""
     try:
-        response = requests.post(f"{BASE_URL}/service/initialize", timeout=30)
+        response = http.post(f"{BASE_URL}/service/initialize", timeout=30)
         print(f"✅ Service initialize: {response.status_code}")
         if response.status_code == 200:
             result = response.json()
@@ -89,7 +92,7 @@ def test_service_initialize():
 def test_service_status():
     """Test service status"""
     try:
-        response = requests.get(f"{BASE_URL}/service/status", timeout=10)
+        response = http.get(f"{BASE_URL}/service/status", timeout=10)
         print(f"✅ Service status: {response.status_code}")
         if response.status_code == 200:
             result = response.json()
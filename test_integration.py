@@ -3,13 +3,13 @@
 Simple integration test to verify frontend-backend connection
 """
 
-import requests
+import asyncio
+import httpx
 import json
-import time
 
 BASE_URL = "http://localhost:8000"
 
-def test_simple_navigation():
+async def test_simple_navigation(client: httpx.AsyncClient):
     """Test a simple navigation test case"""
     
     # Test case: Navigate to Google and check title
@@ -55,7 +55,7 @@ def test_simple_navigation():
     try:
         # Start test session
         print("📤 Starting test session...")
-        response = requests.post(f"{BASE_URL}/test/start", json=test_data, timeout=10)
+        response = await client.post("/test/start", json=test_data)
         
         if response.status_code != 200:
             print(f"❌ Failed to start test session: {response.status_code}")
@@ -67,34 +67,31 @@ def test_simple_navigation():
         print(f"✅ Test session started: {session_id}")
         print()
         
-        # Poll for progress
+        # Follow progress over server-sent events instead of polling
         print("⏳ Monitoring test execution...")
-        max_polls = 30  # 1 minute max
-        poll_count = 0
-        
-        while poll_count < max_polls:
-            time.sleep(2)
-            poll_count += 1
-            
-            try:
-                status_response = requests.get(f"{BASE_URL}/test/status/{session_id}", timeout=5)
-                if status_response.status_code == 200:
-                    status_data = status_response.json()
-                    
-                    print(f"   Progress: {status_data['completed_tests']}/{status_data['total_tests']} "
-                          f"({status_data['progress_percentage']:.1f}%) - Status: {status_data['status']}")
-                    
-                    if status_data['status'] in ['completed', 'error', 'stopped']:
-                        break
+        try:
+            # The server sends a keepalive at least every 15s, so a 60s read timeout only trips on a stall
+            async with client.stream("GET", f"/test/stream/{session_id}", timeout=httpx.Timeout(10, read=60)) as stream:
+                event = None
+                async for line in stream.aiter_lines():
+                    if line.startswith("event: "):
+                        event = line[len("event: "):]
+                    elif line.startswith("data: "):
+                        data = json.loads(line[len("data: "):])
+                        if event == "result":
+                            print(f"   Result: {data['test_case_id']} - {data['status']}")
+                        elif event == "end":
+                            print(f"   Finished - Status: {data['status']}")
+                            break
                         
-            except Exception as e:
-                print(f"   Status check error: {e}")
+        except Exception as e:
+            print(f"   Stream error: {e}")
         
         print()
         
         # Get final results
         print("📊 Getting final results...")
-        results_response = requests.get(f"{BASE_URL}/test/results/{session_id}", timeout=5)
+        results_response = await client.get(f"/test/results/{session_id}")
         
         if results_response.status_code == 200:
             results_data = results_response.json()
@@ -120,25 +117,34 @@ def test_simple_navigation():
         print(f"❌ Integration test failed: {e}")
         return False
 
+async def main() -> bool:
+    """Run the health check and integration test over one pooled connection"""
+    async with httpx.AsyncClient(
+        base_url=BASE_URL,
+        timeout=10,
+        limits=httpx.Limits(max_keepalive_connections=10)
+    ) as client:
+        # Test health first
+        try:
+            health_response = await client.get("/health")
+            if health_response.status_code == 200:
+                print("✅ Backend is healthy and ready")
+            else:
+                print("❌ Backend health check failed")
+                exit(1)
+        except Exception as e:
+            print(f"❌ Cannot connect to backend: {e}")
+            print("   Make sure the backend is running with: python src/backend/start_server.py")
+            exit(1)
+        
+        print()
+        return await test_simple_navigation(client)
+
 if __name__ == "__main__":
     print("🚀 AI Test Tool - Integration Test")
     print("=" * 50)
     
-    # Test health first
-    try:
-        health_response = requests.get(f"{BASE_URL}/health", timeout=5)
-        if health_response.status_code == 200:
-            print("✅ Backend is healthy and ready")
-        else:
-            print("❌ Backend health check failed")
-            exit(1)
-    except Exception as e:
-        print(f"❌ Cannot connect to backend: {e}")
-        print("   Make sure the backend is running with: python src/backend/server.py")
-        exit(1)
-    
-    print()
-    success = test_simple_navigation()
+    success = asyncio.run(main())
     
     if success:
         print("\n🎉 Integration test PASSED! The system is working end-to-end.")
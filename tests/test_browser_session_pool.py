@@ -0,0 +1,100 @@
+"""
+Tests for the pooled browser sessions in src/backend/browser_agent.py
+"""
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "backend"))
+
+try:
+    import browser_agent
+except ImportError:  # browser-use not installed
+    browser_agent = None
+
+
+@unittest.skipIf(browser_agent is None, "browser_agent dependencies are not installed")
+class BrowserSessionPoolReleaseTest(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_release_beyond_max_idle_closes_extras(self):
+        pool = browser_agent.BrowserSessionPool(max_idle=2)
+        config = browser_agent.AgentConfig(headless=True)
+        sessions = [object() for _ in range(5)]
+        closed = []
+        
+        async def reset(session, *args):
+            # Yield so every release passes the capacity check before any put
+            await asyncio.sleep(0)
+            return True
+        
+        async def close(session):
+            closed.append(session)
+        
+        with mock.patch.object(browser_agent, "_reset_browser_session", reset), \
+                mock.patch.object(browser_agent, "_close_browser_session", close):
+            await asyncio.gather(*(pool.release(config, session) for session in sessions))
+        
+        idle = pool._idle[(config.browser_type, config.headless)]
+        self.assertEqual(idle.qsize(), 2)
+        self.assertEqual(len(closed), 3)
+        self.assertEqual(set(closed) | set(idle._queue), set(sessions))
+
+
+
+class _FakePage:
+    def __init__(self, context, url):
+        self.context = context
+        self.url = url
+    
+    async def goto(self, url):
+        self.url = url
+    
+    async def close(self):
+        self.context.pages.remove(self)
+
+
+class _FakeContext:
+    def __init__(self, urls):
+        self.pages = [_FakePage(self, url) for url in urls]
+        self.cdp_calls = []
+    
+    async def new_page(self):
+        page = _FakePage(self, "about:blank")
+        self.pages.append(page)
+        return page
+    
+    async def new_cdp_session(self, page):
+        context = self
+        
+        class _Session:
+            async def send(self, method, params=None):
+                context.cdp_calls.append((method, params))
+            
+            async def detach(self):
+                pass
+        
+        return _Session()
+
+
+@unittest.skipIf(browser_agent is None, "browser_agent dependencies are not installed")
+class ResetBrowserSessionTest(unittest.IsolatedAsyncioTestCase):
+    async def test_reset_closes_extra_tabs_and_clears_every_origin(self):
+        context = _FakeContext(["https://app.example/login", "https://other.example/popup"])
+        session = mock.Mock(browser_context=context, spec=["browser_context", "agent_current_page"])
+        origins = {"https://cdn.example"}
+        
+        self.assertTrue(await browser_agent._reset_browser_session(session, origins))
+        
+        self.assertEqual(len(context.pages), 1)
+        self.assertEqual(context.pages[0].url, "about:blank")
+        self.assertIs(session.agent_current_page, context.pages[0])
+        cleared = {params["origin"] for method, params in context.cdp_calls if method == "Storage.clearDataForOrigin"}
+        self.assertEqual(cleared, {"https://app.example", "https://other.example", "https://cdn.example"})
+        self.assertIn(("Network.clearBrowserCookies", None), context.cdp_calls)
+        self.assertEqual(origins, set())
+
+
+if __name__ == "__main__":
+    unittest.main()